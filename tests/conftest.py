@@ -0,0 +1,22 @@
+import pytest
+
+
+def pytest_configure(config):
+    # Registered here too so the marker is known when pytest-benchmark is absent.
+    config.addinivalue_line("markers", "benchmark: pytest-benchmark micro-benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark-marked tests unless ``--benchmark-only`` is given.
+
+    Calibrating every benchmark would slow the default run considerably. The
+    option is looked up with a default, so the suite also runs without
+    pytest-benchmark installed.
+    """
+
+    if config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark-only")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
@@ -0,0 +1,58 @@
+"""Micro-benchmarks guarding the form parsing and login hot paths.
+
+The default ``pytest`` run skips them (see ``conftest.py``); run them with
+``pytest --benchmark-only``. The module is skipped when pytest-benchmark
+is not installed.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from ticketbot.client import KhamTicketClient  # noqa: E402
+from ticketbot.form_parser import FormParser  # noqa: E402
+
+_PADDING = '<div class="row"><span>節目介紹</span><a href="/item">詳細資訊</a></div>\n' * 2000
+_LOGIN_FORM = """
+<form action="/login" method="post">
+    <input type="hidden" name="__VIEWSTATE" value="{state}">
+    <input type="text" name="txtAccount">
+    <input type="password" name="txtPwd">
+    <select name="area"><option value="n">北部</option><option value="s" selected>南部</option></select>
+    <input type="submit" value="登入">
+</form>
+""".format(state="x" * 4096)
+EVENT_PAGE = "<html><body>" + _PADDING + _LOGIN_FORM + _PADDING + "</body></html>"
+LARGE_BODY = _PADDING * 4 + "<p>登入失敗</p>"
+LARGE_RAW = LARGE_BODY.encode("utf-8")
+
+
+@pytest.mark.benchmark(group="form_parser")
+def test_parse_large_page(benchmark):
+    parser = FormParser("https://example.com/")
+    forms = benchmark(parser.parse, EVENT_PAGE)
+    assert len(forms) == 1
+
+
+@pytest.mark.benchmark(group="form_parser")
+def test_find_first_login_form(benchmark):
+    parser = FormParser("https://example.com/")
+    form = benchmark(parser.find_first, EVENT_PAGE, include_password=True)
+    assert form is not None
+
+
+@pytest.mark.benchmark(group="client")
+def test_resolve_login_fields(benchmark):
+    client = KhamTicketClient("https://example.com/")
+    form = FormParser("https://example.com/").find_first(EVENT_PAGE, include_password=True)
+    assert benchmark(client._resolve_login_fields, form) == ("txtAccount", "txtPwd")
+
+
+@pytest.mark.benchmark(group="client")
+def test_detect_login_failure(benchmark):
+    assert benchmark(KhamTicketClient._detect_login_failure, LARGE_BODY)
+
+
+@pytest.mark.benchmark(group="client")
+def test_detect_login_failure_bytes(benchmark):
+    assert benchmark(KhamTicketClient._detect_login_failure_bytes, LARGE_RAW)
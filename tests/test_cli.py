@@ -7,9 +7,14 @@ from unittest import mock
 
 from ticketbot import cli
 from ticketbot.client import LoginResult, Page
+from ticketbot.form_parser import FormDetails
 
 
 class CLITestCase(unittest.TestCase):
+    def setUp(self):
+        cli._CLIENT_CACHE.clear()
+        self.addCleanup(cli._CLIENT_CACHE.clear)
+
     def test_command_login_success(self):
         fake_client = mock.Mock()
         fake_client.login.return_value = LoginResult(True, "Login succeeded", Page("https://example.com", 200, "OK"))
@@ -81,6 +86,61 @@ class CLITestCase(unittest.TestCase):
         fake_client.submit.assert_called_once()
         fake_client.fetch.assert_called()
 
+    def test_load_config_caches_parse_and_resolves_env(self):
+        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".json") as handle:
+            json.dump({"login": {"account": "${TICKETBOT_TEST_ACCOUNT}"}, "steps": []}, handle)
+            temp_path = handle.name
+
+        try:
+            with mock.patch("ticketbot.cli.json.load", wraps=json.load) as load:
+                with mock.patch.dict(os.environ, {"TICKETBOT_TEST_ACCOUNT": "first"}):
+                    first = cli._load_config(temp_path)
+                with mock.patch.dict(os.environ, {"TICKETBOT_TEST_ACCOUNT": "second"}):
+                    second = cli._load_config(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(first["login"]["account"], "first")
+        self.assertEqual(second["login"]["account"], "second")
+
+    def test_load_config_rejects_invalid_shape(self):
+        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".json") as handle:
+            json.dump({"steps": {"type": "fetch"}}, handle)
+            temp_path = handle.name
+
+        try:
+            with self.assertRaises(ValueError):
+                cli._load_config(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+    def test_get_client_reuses_instance_per_base_url_and_timeout(self):
+        with mock.patch("ticketbot.cli.KhamTicketClient", side_effect=lambda *a, **kw: mock.Mock()) as client_cls:
+            first = cli._get_client("https://example.com", 15)
+            second = cli._get_client("https://example.com", 15.0)
+            other = cli._get_client("https://example.com", 5.0)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(client_cls.call_count, 2)
+
+    def test_keyword_predicate_decodes_double_byte_pages(self):
+        predicate = cli._keyword_predicate("A")
+        # The Big5 encoding of "丕" is b"\xa5A", whose trail byte is an ASCII "A".
+        self.assertFalse(predicate(Page("https://example.com", 200, raw="丕".encode("big5"), charset="big5")))
+        self.assertTrue(predicate(Page("https://example.com", 200, raw="丕A".encode("utf-8"))))
+
+    def test_select_form_matches_required_fields(self):
+        search = FormDetails("https://example.com/search", "GET", {"q": ""}, {"q": "text"})
+        order = FormDetails("https://example.com/order", "POST", {"qty": "1", "seat": ""}, {})
+        forms = [search, order]
+
+        self.assertIs(cli._select_form(forms, {}), search)
+        self.assertIs(cli._select_form(forms, {"required_fields": ["seat", "qty"]}), order)
+        self.assertIsNone(cli._select_form(forms, {"required_fields": ["seat", "missing"]}))
+        self.assertIs(cli._select_form(forms, {"action_contains": "e", "index": 1}), order)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,28 +1,50 @@
+import io
 import unittest
 from unittest import mock
 
+import requests
+
 from ticketbot.client import KhamTicketClient, LoginResult, Page
+from ticketbot.form_parser import FormDetails
+
+
+LOGIN_URL = "https://example.com/application/utk01/UTK0101_03.aspx"
+
+LOGIN_HTML = """
+<form action="/login" method="post">
+    <input type="text" name="txtAccount">
+    <input type="password" name="txtPwd">
+    <input type="hidden" name="__VIEWSTATE" value="abc">
+    <input type="submit" value="登入">
+</form>
+"""
+NO_FORM_HTML = "<html><body>No form here</body></html>"
+SUCCESS_HTML = "<html>登入成功</html>"
+FAILURE_HTML = "<html>登入失敗，密碼錯誤</html>"
+
+FAILURE_DETECTION_CASES = [
+    ("<p>登入失敗</p>", True),
+    ("<b>Login Failed</b>", True),
+    ("<b>LOGIN FAILED</b>", True),
+    ("<p>登入成功</p>", False),
+]
+
+LOGIN_OUTCOMES = [
+    ("success", [LOGIN_HTML, SUCCESS_HTML], True, "Login succeeded"),
+    ("form_missing", [NO_FORM_HTML], False, "Login form not found"),
+    ("rejected", [LOGIN_HTML, FAILURE_HTML], False, "Login rejected"),
+]
 
 
 class ClientLoginTestCase(unittest.TestCase):
     def setUp(self):
-        self.client = KhamTicketClient("https://example.com/application/utk01/UTK0101_03.aspx")
+        self.client = KhamTicketClient(LOGIN_URL)
 
     def test_successful_login_submits_credentials(self):
-        login_html = """
-        <form action="/login" method="post">
-            <input type="text" name="txtAccount">
-            <input type="password" name="txtPwd">
-            <input type="hidden" name="__VIEWSTATE" value="abc">
-            <input type="submit" value="登入">
-        </form>
-        """
-        success_html = "<html>登入成功</html>"
-
         responses = iter(
             [
-                Page(url="https://example.com/application/utk01/UTK0101_03.aspx", status=200, body=login_html),
-                Page(url="https://example.com/member", status=200, body=success_html),
+                Page(url=LOGIN_URL, status=200, body=LOGIN_HTML),
+                Page(url="https://example.com/member", status=200, body=SUCCESS_HTML),
             ]
         )
         captured_requests = []
@@ -36,44 +58,108 @@ class ClientLoginTestCase(unittest.TestCase):
 
         self.assertTrue(result.success)
         self.assertEqual(len(captured_requests), 2)
-        self.assertEqual(captured_requests[0].get_method(), "GET")
-        self.assertEqual(captured_requests[1].get_method(), "POST")
-        self.assertIn(b"txtAccount=user123", captured_requests[1].data)
-        self.assertIn(b"txtPwd=pass456", captured_requests[1].data)
+        self.assertEqual(captured_requests[0].method, "GET")
+        self.assertEqual(captured_requests[1].method, "POST")
+        self.assertIn(b"txtAccount=user123", captured_requests[1].body)
+        self.assertIn(b"txtPwd=pass456", captured_requests[1].body)
+
+    def test_login_outcomes(self):
+        for case, bodies, expected_success, expected_message in LOGIN_OUTCOMES:
+            with self.subTest(case):
+                responses = iter([Page(url=LOGIN_URL, status=200, body=body) for body in bodies])
+                with mock.patch.object(self.client, "_open", side_effect=lambda request: next(responses)):
+                    result = self.client.login("user", "pass")
+                self.assertEqual(result.success, expected_success)
+                self.assertIn(expected_message, result.message)
+
+    def test_resolve_login_fields_prefers_keyword_match(self):
+        form = FormDetails(
+            action="https://example.com/login",
+            method="POST",
+            fields={},
+            field_types={"q": "text", "nickname": "text", "txtMemberNo": "text", "txtPwd": "password"},
+        )
+        self.assertEqual(self.client._resolve_login_fields(form), ("txtMemberNo", "txtPwd"))
+
+    def test_login_failure_detection_ignores_ascii_case(self):
+        for body, expected in FAILURE_DETECTION_CASES:
+            with self.subTest(body=body):
+                self.assertEqual(KhamTicketClient._detect_login_failure(body), expected)
+                page = Page(LOGIN_URL, 200, raw=body.encode("utf-8"))
+                self.assertEqual(KhamTicketClient._page_indicates_failure(page), expected)
+
 
-    def test_login_failure_when_form_missing(self):
-        login_html = "<html><body>No form here</body></html>"
+def _make_response(url, status, body=b"", headers=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
 
+
+class ClientPollingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = KhamTicketClient("https://example.com")
+
+    def test_poll_until_sends_validators_and_backs_off_on_304(self):
+        url = "https://example.com/event"
         responses = iter(
             [
-                Page(url="https://example.com/application/utk01/UTK0101_03.aspx", status=200, body=login_html),
+                _make_response(url, 200, b"wait", {"ETag": '"v1"'}),
+                _make_response(url, 304),
+                _make_response(url, 304),
+                _make_response(url, 200, b"open", {"ETag": '"v2"'}),
             ]
         )
+        sent = []
+
+        def fake_send(request, **kwargs):
+            sent.append(request)
+            return next(responses)
+
+        with mock.patch.object(self.client._session, "send", side_effect=fake_send), mock.patch(
+            "ticketbot.client.time.sleep"
+        ) as sleep:
+            page = self.client.poll_until(url, predicate=lambda page: "open" in page.body, interval=0.5)
 
-        with mock.patch.object(self.client, "_open", side_effect=lambda request: next(responses)):
-            result = self.client.login("user", "pass")
-        self.assertFalse(result.success)
-        self.assertIn("Login form not found", result.message)
-
-    def test_login_failure_detected_from_response_body(self):
-        login_html = """
-        <form action="/login" method="post">
-            <input type="text" name="txtAccount">
-            <input type="password" name="txtPwd">
-        </form>
-        """
-        failure_html = "<html>登入失敗，密碼錯誤</html>"
+        self.assertEqual(page.body, "open")
+        self.assertNotIn("If-None-Match", sent[0].headers)
+        self.assertEqual(sent[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 0.5, 1.0])
+        self.assertEqual(self.client.last_page.body, "open")
+
+    def test_poll_until_checks_page_fetched_before_polling(self):
+        url = "https://example.com/event"
         responses = iter(
             [
-                Page(url="https://example.com/application/utk01/UTK0101_03.aspx", status=200, body=login_html),
-                Page(url="https://example.com/application/utk01/UTK0101_03.aspx", status=200, body=failure_html),
+                _make_response(url, 200, b"open", {"ETag": '"v1"'}),
+                _make_response(url, 200, b"open", {"ETag": '"v1"'}),
             ]
         )
+        sent = []
+
+        def fake_send(request, **kwargs):
+            sent.append(request)
+            return next(responses)
+
+        with mock.patch.object(self.client._session, "send", side_effect=fake_send), mock.patch(
+            "ticketbot.client.time.sleep"
+        ):
+            self.client.fetch(url)
+            page = self.client.poll_until(url, predicate=lambda page: "open" in page.body)
+
+        self.assertEqual(page.body, "open")
+        self.assertEqual(len(sent), 2)
+        self.assertNotIn("If-None-Match", sent[1].headers)
+
 
-        with mock.patch.object(self.client, "_open", side_effect=lambda request: next(responses)):
-            result = self.client.login("user", "pass")
-        self.assertFalse(result.success)
-        self.assertIn("Login rejected", result.message)
+class PageTestCase(unittest.TestCase):
+    def test_body_is_decoded_lazily_from_raw(self):
+        page = Page("https://example.com", 200, raw="售票中".encode("big5"), charset="big5")
+        self.assertIsNone(page._body)
+        self.assertEqual(page.body, "售票中")
+        self.assertEqual(Page("https://example.com", 200, "abc").raw, b"abc")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,33 @@
 import unittest
+from unittest import mock
 
+from ticketbot import form_parser
 from ticketbot.form_parser import FormParser
 
+QUOTED_FORM_PAGES = [
+    (
+        "comment",
+        '<!-- <form action="/old" method="post"><input type="password" name="oldpw"></form> -->'
+        '<form action="/login" method="post"><input type="password" name="pwd"></form>',
+    ),
+    (
+        "script",
+        "<script>document.write('<form action=\"/old\"><input type=\"password\" name=\"oldpw\"></form>');</script>"
+        '<form action="/login" method="post"><input type="password" name="pwd"></form>',
+    ),
+    (
+        "comment_inside_form",
+        '<form action="/login" method="post"><!-- legacy: </form> -->'
+        '<input name="acct"><input type="password" name="pwd"></form>',
+    ),
+    (
+        "script_inside_form",
+        '<form action="/login" method="post"><input name="acct">'
+        "<script>document.write('</form>');</script>"
+        '<input type="password" name="pwd"></form>',
+    ),
+]
+
 
 class FormParserTestCase(unittest.TestCase):
     def test_parse_basic_form(self):
@@ -45,6 +71,34 @@ class FormParserTestCase(unittest.TestCase):
         self.assertIsNotNone(form)
         self.assertEqual(form.action, "https://example.com/two")
 
+    def test_parse_first_stops_at_matching_form(self):
+        html = """
+        <form action="/search"><input name="q"></form>
+        <form action="/login" method="post"><input type="password" name="pwd"></form>
+        <form action="/later"><input type="password" name="other"></form>
+        """
+        parser = FormParser("https://example.com/")
+        form = parser.parse_first(html, lambda candidate: candidate.method == "POST")
+        self.assertIsNotNone(form)
+        self.assertEqual(form.action, "https://example.com/login")
+        self.assertIsNone(parser.parse_first(html, lambda candidate: False))
+
+    def test_form_markup_keeps_only_form_ranges(self):
+        html = '<div>intro</div><FORM action="/a"><input name="x"></FORM><script>var s = 1;</script>'
+        self.assertEqual(FormParser._form_markup(html), '<FORM action="/a"><input name="x"></FORM>')
+        self.assertEqual(FormParser._form_markup("<p>no forms</p>"), "<p>no forms</p>")
+
+    def test_find_first_ignores_forms_in_comments_and_scripts(self):
+        parser = FormParser("https://example.com/")
+        for backend, module in (("lxml", form_parser.lxml), ("html.parser", None)):
+            for case, html in QUOTED_FORM_PAGES:
+                with self.subTest(backend=backend, case=case):
+                    with mock.patch.object(form_parser, "lxml", module):
+                        form = parser.find_first(html, include_password=True)
+                        self.assertEqual(form.action, "https://example.com/login")
+                        self.assertIn("pwd", form.fields)
+                        self.assertEqual(len(list(parser.parse(html))), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
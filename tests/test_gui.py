@@ -1,9 +1,37 @@
+import queue
+import threading
+import types
 import unittest
 from unittest import mock
 
 from ticketbot import cli
 from ticketbot import gui
 
+SPLIT_EXTRA_CASES = [
+    (" a=1  b=2\nc=3 ", ["a=1", "b=2", "c=3"]),
+    ("", []),
+    ("a=1\tb=2", ["a=1", "b=2"]),
+    ("a=1 junk b=", ["a=1", "b="]),
+]
+OUTPUT_KEY_CASES = [
+    ("x", 0x0, "break"),
+    ("BackSpace", 0x0, "break"),
+    ("v", 0x4, "break"),
+    ("Down", 0x0, None),
+    ("Tab", 0x0, None),
+    ("ISO_Left_Tab", 0x1, None),
+    ("c", 0x4, None),
+    ("C", 0x5, None),
+    ("a", 0x4, None),
+    ("Insert", 0x4, None),
+    ("c", 0x8, None),
+]
+PARSE_TIMEOUT_CASES = [
+    ("1.5", 1.5),
+    ("", cli.DEFAULT_TIMEOUT),
+    ("abc", cli.DEFAULT_TIMEOUT),
+]
+
 
 class TicketBotGUITestCase(unittest.TestCase):
     def test_run_gui_invokes_application(self):
@@ -14,11 +42,205 @@ class TicketBotGUITestCase(unittest.TestCase):
         app_instance.run.assert_called_once()
 
     def test_helper_parsers(self):
-        self.assertEqual(gui.TicketBotGUI._split_extra(" a=1  b=2\nc=3 "), ["a=1", "b=2", "c=3"])
-        self.assertEqual(gui.TicketBotGUI._split_extra(""), [])
-        self.assertAlmostEqual(gui.TicketBotGUI._parse_timeout("1.5"), 1.5)
-        self.assertEqual(gui.TicketBotGUI._parse_timeout(""), cli.DEFAULT_TIMEOUT)
-        self.assertEqual(gui.TicketBotGUI._parse_timeout("abc"), cli.DEFAULT_TIMEOUT)
+        for value, expected in SPLIT_EXTRA_CASES:
+            with self.subTest(split_extra=value):
+                self.assertEqual(gui.TicketBotGUI._split_extra(value), expected)
+        for value, expected in PARSE_TIMEOUT_CASES:
+            with self.subTest(parse_timeout=value):
+                self.assertAlmostEqual(gui.TicketBotGUI._parse_timeout(value), expected)
+
+    def test_output_key_filter(self):
+        for keysym, state, expected in OUTPUT_KEY_CASES:
+            with self.subTest(keysym=keysym, state=state):
+                event = types.SimpleNamespace(keysym=keysym, state=state)
+                self.assertEqual(gui.TicketBotGUI._on_output_key(event), expected)
+
+
+def _make_headless_gui():
+    """Return a TicketBotGUI with just the state the output pipeline touches."""
+
+    app = gui.TicketBotGUI.__new__(gui.TicketBotGUI)
+    app._root = mock.Mock()
+    app._action_buttons = {"登入": mock.Mock()}
+    app._pending = []
+    app._flush_scheduled = False
+    app._status = mock.Mock()
+    app._status_clear_id = None
+    app._after_ids = set()
+    app._traces = []
+    return app
+
+
+class CommandPipelineTestCase(unittest.TestCase):
+    def test_drain_queue_finalizes_on_sentinel(self):
+        app = _make_headless_gui()
+        output_queue = queue.Queue()
+        for item in ("first\n", "second\n", None):
+            output_queue.put(item)
+
+        app._drain_queue("登入", output_queue, [2])
+
+        self.assertEqual(app._pending[0], "first\nsecond\n")
+        self.assertIn("[登入] 失敗 (代碼 2)\n", app._pending)
+        app._action_buttons["登入"].state.assert_called_once_with(["!disabled"])
+        app._status.set.assert_called_once()
+
+    def test_drain_queue_reschedules_until_sentinel(self):
+        app = _make_headless_gui()
+        output_queue = queue.Queue()
+        output_queue.put("partial\n")
+        exit_codes = []
+
+        app._drain_queue("登入", output_queue, exit_codes)
+
+        delay, callback = app._root.after.call_args.args
+        self.assertEqual(delay, app.FLUSH_INTERVAL_MS)
+        app._action_buttons["登入"].state.assert_not_called()
+
+        output_queue.put(None)
+        exit_codes.append(0)
+        callback()
+        app._action_buttons["登入"].state.assert_called_once_with(["!disabled"])
+        self.assertEqual(app._pending[-1], "[登入] 成功\n")
+
+    def test_finalize_command_reports_success(self):
+        app = _make_headless_gui()
+        app._finalize_command("登入", 0)
+        self.assertEqual(app._pending, ["[登入] 成功\n"])
+        app._action_buttons["登入"].state.assert_called_once_with(["!disabled"])
+        app._status.set.assert_not_called()
+
+    def test_flush_output_keeps_max_output_lines(self):
+        app = _make_headless_gui()
+        app._output = mock.Mock()
+        limit = app.MAX_OUTPUT_LINES
+        for end_index, expected_delete in (
+            (f"{limit + 1}.0", None),
+            (f"{limit + 2}.0", mock.call("1.0", "2.0")),
+            (f"{limit + 1}.3", mock.call("1.0", "2.0")),
+        ):
+            with self.subTest(end_index=end_index):
+                app._output.reset_mock()
+                app._output.index.return_value = end_index
+                app._pending = ["line\n"]
+                app._flush_output()
+                self.assertEqual(app._output.delete.call_args, expected_delete)
+
+    def test_shutdown_cancels_pending_callbacks(self):
+        app = _make_headless_gui()
+        app._root.after.side_effect = ["after#1", "after#2"]
+        app._executor = mock.Mock()
+        app._loop = mock.Mock()
+        app._closed = False
+        variable = mock.Mock()
+        app._traces = [(variable, "trace#1")]
+        fired = mock.Mock()
+        app._after(10, fired, "x")
+        app._after(20, fired, "y")
+        app._root.after.call_args_list[0].args[1]()
+
+        app._shutdown()
+        app._shutdown()
+
+        fired.assert_called_once_with("x")
+        app._root.after_cancel.assert_called_once_with("after#2")
+        variable.trace_remove.assert_called_once_with("write", "trace#1")
+        app._executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        app._loop.call_soon_threadsafe.assert_called_once_with(app._loop.stop)
+
+    def test_on_login_reports_malformed_extra_fields(self):
+        app = _make_headless_gui()
+        values = {"_login_account": "user", "_login_password": "pass", "_login_extra": "a=1 junk b= =x"}
+        for name, value in values.items():
+            setattr(app, name, mock.Mock(**{"get.return_value": value}))
+
+        with mock.patch.object(app, "_run_command") as run_command:
+            app._on_login()
+
+        run_command.assert_not_called()
+        message = app._status.set.call_args.args[0]
+        self.assertIn("junk =x", message)
+        self.assertNotIn("a=1", message)
+
+
+class RootCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(gui, "tk")
+        self.tk = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tk.TclError = RuntimeError
+        self.addCleanup(setattr, gui, "_root_cache", None)
+        gui._root_cache = None
+
+    def test_reuses_root_and_destroys_previous_widgets(self):
+        root = self.tk.Tk.return_value
+        child = mock.Mock()
+        self.assertIs(gui._get_or_create_root(), root)
+        root.winfo_children.return_value = [child]
+
+        self.assertIs(gui._get_or_create_root(), root)
+
+        self.tk.Tk.assert_called_once_with()
+        child.destroy.assert_called_once_with()
+        root.deiconify.assert_called_once_with()
+
+    def test_recreates_root_after_it_was_destroyed(self):
+        stale = mock.Mock()
+        stale.winfo_exists.side_effect = RuntimeError("application has been destroyed")
+        gui._root_cache = stale
+
+        root = gui._get_or_create_root()
+
+        self.assertIs(root, self.tk.Tk.return_value)
+        stale.winfo_children.assert_not_called()
+
+
+class QueueWriterTestCase(unittest.TestCase):
+    def test_write_queues_complete_lines(self):
+        output_queue = queue.Queue()
+        writer = gui._QueueWriter(output_queue)
+        writer.write("hel")
+        writer.write("lo\n")
+        writer.write("")
+        self.assertEqual(output_queue.get_nowait(), "hello\n")
+        self.assertTrue(output_queue.empty())
+
+    def test_flush_queues_trailing_partial_line(self):
+        output_queue = queue.Queue()
+        writer = gui._QueueWriter(output_queue)
+        self.assertEqual(writer.write("tail"), 4)
+        self.assertTrue(output_queue.empty())
+        writer.flush()
+        writer.flush()
+        self.assertEqual(output_queue.get_nowait(), "tail")
+        self.assertTrue(output_queue.empty())
+
+
+class SerialExecutorTestCase(unittest.TestCase):
+    def test_runs_calls_in_order_and_cancels_pending_on_shutdown(self):
+        executor = gui._SerialExecutor()
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def first():
+            started.set()
+            release.wait(5)
+            order.append("first")
+
+        running = executor.submit(first)
+        queued = executor.submit(order.append, "second")
+        self.assertTrue(started.wait(5))
+
+        executor.shutdown(wait=False, cancel_futures=True)
+        release.set()
+        running.result(timeout=5)
+
+        self.assertTrue(queued.cancelled())
+        self.assertEqual(order, ["first"])
+        self.assertTrue(executor._thread.daemon)
+        with self.assertRaises(RuntimeError):
+            executor.submit(order.append, "late")
 
 
 if __name__ == "__main__":
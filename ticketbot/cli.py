@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
+import re
 import sys
-from typing import Dict, Iterable, List, Optional
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .client import KhamTicketClient
 from .form_parser import FormDetails, FormParser
@@ -14,6 +17,18 @@ from .form_parser import FormDetails, FormParser
 DEFAULT_BASE_URL = "https://kham.com.tw/application/utk01/UTK0101_03.aspx"
 DEFAULT_TIMEOUT = 15.0
 
+_ENV_RE = re.compile(r"\$\{([^}]+)\}")
+_CLIENT_CACHE: Dict[Tuple[str, float], KhamTicketClient] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, object]]] = {}
+_CONFIG_SHAPE = {
+    "base_url": (str,),
+    "timeout": (int, float),
+    "login": (dict,),
+    "steps": (list,),
+    "polling": (dict,),
+}
+
 
 def _add_common_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
@@ -29,18 +44,32 @@ def _add_common_arguments(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _get_client(base_url: str, timeout: float) -> KhamTicketClient:
+    """Return the process-wide client for ``base_url``, keeping its session and cookies.
+
+    The cache itself is thread-safe, but a client is not: callers running
+    commands from several threads must serialise their use of it.
+    """
+
+    key = (base_url, float(timeout))
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = KhamTicketClient(base_url, timeout=timeout)
+            _CLIENT_CACHE[key] = client
+    return client
+
+
 def _parse_key_value_pairs(pairs: Iterable[str]) -> Dict[str, str]:
-    result: Dict[str, str] = {}
-    for pair in pairs:
-        if "=" not in pair:
-            raise ValueError(f"Invalid key=value pair: {pair}")
-        key, value = pair.split("=", 1)
-        result[key] = value
-    return result
+    pairs = list(pairs)
+    invalid = next((pair for pair in pairs if "=" not in pair), None)
+    if invalid is not None:
+        raise ValueError(f"Invalid key=value pair: {invalid}")
+    return dict(pair.split("=", 1) for pair in pairs)
 
 
 def command_login(args: argparse.Namespace) -> int:
-    client = KhamTicketClient(args.base_url, timeout=args.timeout)
+    client = _get_client(args.base_url, args.timeout)
     extras = _parse_key_value_pairs(args.extra) if args.extra else None
     result = client.login(
         account=args.account,
@@ -69,7 +98,7 @@ def _describe_form(form: FormDetails, index: int) -> str:
 
 
 def command_dump_forms(args: argparse.Namespace) -> int:
-    client = KhamTicketClient(args.base_url, timeout=args.timeout)
+    client = _get_client(args.base_url, args.timeout)
     page = client.fetch(args.url or args.base_url)
     parser = FormParser(page.url)
     forms = list(parser.parse(page.body))
@@ -83,30 +112,85 @@ def command_dump_forms(args: argparse.Namespace) -> int:
     return 0
 
 
-def _resolve_env(value: str) -> str:
-    if value.startswith("${") and value.endswith("}"):
-        env_key = value[2:-1]
-        return os.environ.get(env_key, "")
+def _resolve_config_env(value):
+    """Return a copy of ``value`` with every ``${VAR}`` string resolved."""
+
+    if isinstance(value, dict):
+        return {key: _resolve_config_env(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_config_env(item) for item in value]
+    if isinstance(value, str):
+        match = _ENV_RE.fullmatch(value)
+        return os.environ.get(match.group(1), "") if match else value
     return value
 
 
-def _select_form(forms: List[FormDetails], criteria: Dict[str, object]) -> Optional[FormDetails]:
+def _validate_config(config: object) -> None:
+    if not isinstance(config, dict):
+        raise ValueError("Configuration must be a JSON object")
+    for key, types in _CONFIG_SHAPE.items():
+        value = config.get(key)
+        if value is not None and not isinstance(value, types):
+            raise ValueError(f"Configuration key '{key}' has an invalid type")
+    for step in config.get("steps") or []:
+        if not isinstance(step, dict):
+            raise ValueError("Each configuration step must be a JSON object")
+
+
+def _load_config(path: str) -> Dict[str, object]:
+    """Load ``path``, reusing the parsed JSON until the file size or mtime changes."""
+
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cache_key = os.path.abspath(path)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        config = cached[1]
+    else:
+        with open(path, "r", encoding="utf-8") as handle:
+            config = json.load(handle)
+        _validate_config(config)
+        _CONFIG_CACHE[cache_key] = (stamp, config)
+    return _resolve_config_env(config)
+
+
+def _keyword_predicate(keyword: Optional[str]):
+    if not keyword:
+        return lambda page: True
+
+    encoded = keyword.encode("utf-8")
+
+    def predicate(page) -> bool:
+        # Double-byte charsets such as Big5 reuse ASCII values for trail bytes,
+        # so only UTF-8 pages can be matched without decoding.
+        if page.is_utf8:
+            return encoded in page.raw
+        return keyword in page.body
+
+    return predicate
+
+
+def _select_form(forms: Iterable[FormDetails], criteria: Dict[str, object]) -> Optional[FormDetails]:
     action_contains = criteria.get("action_contains")
-    required_fields = set(criteria.get("required_fields", []) or [])
+    required = criteria.get("required_fields")
+    required_fields = frozenset(required) if required else None
     index = criteria.get("index")
     filtered = []
     for form in forms:
         if action_contains and action_contains not in form.action:
             continue
-        if required_fields and not required_fields.issubset(form.fields.keys()):
+        # Keys views support subset tests directly, so no per-form set is built.
+        if required_fields and not required_fields <= form.fields.keys():
             continue
+        if index is None:
+            return form
         filtered.append(form)
-    if index is not None:
-        try:
-            return filtered[int(index)]
-        except (IndexError, ValueError):
-            return None
-    return filtered[0] if filtered else None
+    if index is None:
+        return None
+    try:
+        return filtered[int(index)]
+    except (IndexError, ValueError):
+        return None
 
 
 def _execute_step(client: KhamTicketClient, current_page, step: Dict[str, object]):
@@ -121,26 +205,25 @@ def _execute_step(client: KhamTicketClient, current_page, step: Dict[str, object
         print(f"Fetching {url} for form submission ...")
         current_page = client.fetch(url)
     parser = FormParser(current_page.url)
-    forms = list(parser.parse(current_page.body))
+    forms = parser.parse(current_page.body)
     criteria = step.get("form") or {}
     form = _select_form(forms, criteria)
     if form is None:
         raise RuntimeError("No form matches the provided criteria")
-    overrides = {key: _resolve_env(str(value)) for key, value in (step.get("overrides") or {}).items()}
+    overrides = {key: str(value) for key, value in (step.get("overrides") or {}).items()}
     print(f"Submitting form to {form.action} ...")
     return client.submit(form, overrides)
 
 
 def command_run_config(args: argparse.Namespace) -> int:
-    with open(args.config, "r", encoding="utf-8") as handle:
-        config = json.load(handle)
+    config = _load_config(args.config)
 
-    client = KhamTicketClient(config.get("base_url", args.base_url), timeout=config.get("timeout", args.timeout))
+    client = _get_client(config.get("base_url", args.base_url), config.get("timeout", args.timeout))
     login_cfg = config.get("login")
     if login_cfg:
-        account = _resolve_env(str(login_cfg.get("account", "")))
-        password = _resolve_env(str(login_cfg.get("password", "")))
-        extra = {k: _resolve_env(str(v)) for k, v in (login_cfg.get("extra_overrides") or {}).items()}
+        account = str(login_cfg.get("account", ""))
+        password = str(login_cfg.get("password", ""))
+        extra = {k: str(v) for k, v in (login_cfg.get("extra_overrides") or {}).items()}
         result = client.login(account, password, login_page=login_cfg.get("page"), extra_overrides=extra)
         print(result.message)
         if not result.success:
@@ -158,10 +241,9 @@ def command_run_config(args: argparse.Namespace) -> int:
     poll_cfg = config.get("polling")
     if poll_cfg:
         url = poll_cfg.get("url") or (current_page.url if current_page else client.base_url)
-        keyword = poll_cfg.get("keyword")
         success = client.poll_until(
             url,
-            predicate=lambda page: (keyword in page.body) if keyword else True,
+            predicate=_keyword_predicate(poll_cfg.get("keyword")),
             interval=float(poll_cfg.get("interval", 0.5)),
             max_attempts=int(poll_cfg.get("max_attempts", 30)),
         )
@@ -173,6 +255,13 @@ def command_run_config(args: argparse.Namespace) -> int:
 
 
 def build_parser() -> argparse.ArgumentParser:
+    """Return the shared CLI parser, constructing it on first use."""
+
+    return _cached_parser()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="KHAM ticket bot helper")
     subparsers = parser.add_subparsers(dest="command")
 
@@ -2,29 +2,94 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
+import re
 import time
-from dataclasses import dataclass
-from http.cookiejar import CookieJar
-from typing import Dict, Iterable, Optional, Tuple
-from urllib.error import HTTPError, URLError
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode, urljoin
-from urllib.request import HTTPCookieProcessor, OpenerDirector, Request, build_opener
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from .form_parser import FormDetails, FormParser
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# CJK signatures have no case, so they are matched verbatim; only the ASCII
+# signature needs case folding.
+_FAILURE_SIGNATURES = (
+    "登入失敗",
+    "密碼錯誤",
+    "驗證碼",
+)
+_ASCII_FAILURE_SIGNATURE = "login failed"
+_FAILURE_BYTES = tuple(signature.encode("utf-8") for signature in _FAILURE_SIGNATURES)
+_ASCII_FAILURE_BYTES = _ASCII_FAILURE_SIGNATURE.encode("ascii")
+
+_READ_CHUNK_SIZE = 32768
+_MAX_BACKOFF_FACTOR = 8
+
+_LOGIN_KEYWORDS = ("account", "member", "userid", "username", "login", "email", "id")
+_LOGIN_KEYWORD_RE = re.compile("|".join(_LOGIN_KEYWORDS), re.IGNORECASE)
+_USERNAME_FIELD_TYPES = frozenset({"text", "email", "tel"})
 
-@dataclass
+
+@dataclass(init=False, eq=False, slots=True)
 class Page:
+    """A fetched page whose text is decoded from ``raw`` only when first read."""
+
     url: str
     status: int
-    body: str
+    charset: str
+    _body: Optional[str] = field(default=None, repr=False)
+    _raw: Optional[bytes] = field(default=None, repr=False)
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        body: Optional[str] = None,
+        *,
+        raw: Optional[bytes] = None,
+        charset: str = "utf-8",
+    ) -> None:
+        self.url = url
+        self.status = status
+        self.charset = charset
+        self._body = "" if body is None and raw is None else body
+        self._raw = raw
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Page):
+            return NotImplemented
+        return (self.url, self.status, self.body) == (other.url, other.status, other.body)
 
-@dataclass
+    @property
+    def body(self) -> str:
+        if self._body is None:
+            self._body = self._raw.decode(self.charset, errors="ignore")
+        return self._body
+
+    @property
+    def is_utf8(self) -> bool:
+        """Whether ``raw`` is UTF-8, so byte-level substring checks cannot straddle characters."""
+
+        try:
+            return codecs.lookup(self.charset).name == "utf-8"
+        except LookupError:
+            return False
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            self._raw = self._body.encode(self.charset, errors="ignore")
+        return self._raw
+
+
+@dataclass(slots=True)
 class LoginResult:
     success: bool
     message: str
@@ -37,48 +102,87 @@ class KhamTicketClient:
     def __init__(self, base_url: str, *, timeout: float = 15.0, user_agent: Optional[str] = None) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.cookie_jar = CookieJar()
-        self._opener: OpenerDirector = build_opener(HTTPCookieProcessor(self.cookie_jar))
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self.cookie_jar = self._session.cookies
         self._user_agent = user_agent or (
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
             "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
         )
         self.last_page: Optional[Page] = None
+        self._validators: Dict[str, Dict[str, str]] = {}
 
-    def _create_request(self, url: str, data: Optional[Dict[str, str]] = None, method: Optional[str] = None) -> Request:
+    def _create_request(
+        self,
+        url: str,
+        data: Optional[Dict[str, str]] = None,
+        method: Optional[str] = None,
+        *,
+        conditional: bool = False,
+    ) -> requests.PreparedRequest:
         if not url.startswith("http"):
             url = urljoin(self.base_url + "/", url)
-        encoded_data = None
-        if data is not None:
-            encoded_data = urlencode(data).encode("utf-8")
-        request = Request(url, data=encoded_data)
-        if method:
-            request.get_method = lambda m=method.upper(): m  # type: ignore[assignment]
-        request.add_header("User-Agent", self._user_agent)
-        request.add_header("Origin", self.base_url)
-        request.add_header("Referer", self.base_url)
-        request.add_header("Content-Type", "application/x-www-form-urlencoded")
-        return request
-
-    def _open(self, request: Request) -> Page:
-        response = self._opener.open(request, timeout=self.timeout)
-        raw = response.read()
+        encoded_data = None if data is None else urlencode(data).encode("ascii")
+        method = (method or ("GET" if data is None else "POST")).upper()
+        headers = {
+            "User-Agent": self._user_agent,
+            "Origin": self.base_url,
+            "Referer": self.base_url,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        request = requests.Request(method, url, data=encoded_data, headers=headers)
+        prepared = self._session.prepare_request(request)
+        if conditional:
+            prepared.headers.update(self._validators.get(prepared.url, {}))
+        return prepared
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, str]] = None,
+        *,
+        conditional: bool = False,
+    ) -> Page:
+        return self._open(self._create_request(url, data, method, conditional=conditional))
+
+    def _open(self, request: requests.PreparedRequest) -> Page:
+        response = self._session.send(request, timeout=self.timeout, allow_redirects=True, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = [chunk for chunk in response.iter_content(_READ_CHUNK_SIZE) if chunk]
+        finally:
+            response.close()
         charset = "utf-8"
-        if response.headers.get_content_charset():
-            charset = response.headers.get_content_charset() or charset
-        text = raw.decode(charset, errors="ignore")
-        page = Page(url=response.geturl(), status=getattr(response, "status", response.getcode()), body=text)
+        if "charset=" in response.headers.get("Content-Type", "").lower():
+            charset = response.encoding or charset
+        page = Page(url=response.url, status=response.status_code, raw=b"".join(chunks), charset=charset)
+        if page.status == 304:
+            return page
+        if request.method == "GET":
+            self._remember_validators(request.url, response.headers)
         self.last_page = page
         return page
 
+    def _remember_validators(self, url: str, headers) -> None:
+        validators = {}
+        if headers.get("ETag"):
+            validators["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        if validators:
+            self._validators[url] = validators
+        else:
+            self._validators.pop(url, None)
+
     def fetch(self, url: str) -> Page:
-        request = self._create_request(url)
-        return self._open(request)
+        return self._request("GET", url)
 
     def submit(self, form: FormDetails, overrides: Optional[Dict[str, str]] = None) -> Page:
         action, method, payload = form.merged_with(overrides)
-        request = self._create_request(action, payload, method)
-        return self._open(request)
+        return self._request(method, action, payload)
 
     def login(
         self,
@@ -91,7 +195,7 @@ class KhamTicketClient:
         login_url = login_page or self.base_url
         try:
             page = self.fetch(login_url)
-        except (URLError, HTTPError) as exc:
+        except requests.RequestException as exc:
             return LoginResult(success=False, message=f"Unable to load login page: {exc}")
 
         parser = FormParser(login_url)
@@ -109,46 +213,46 @@ class KhamTicketClient:
 
         try:
             result_page = self.submit(form, overrides)
-        except (URLError, HTTPError) as exc:
+        except requests.RequestException as exc:
             return LoginResult(success=False, message=f"Login request failed: {exc}", page=page)
 
-        if self._detect_login_failure(result_page.body):
+        if self._page_indicates_failure(result_page):
             return LoginResult(success=False, message="Login rejected by server", page=result_page)
         return LoginResult(success=True, message="Login succeeded", page=result_page)
 
     def _resolve_login_fields(self, form: FormDetails) -> Tuple[Optional[str], Optional[str]]:
-        password_field = None
-        for name, field_type in form.field_types.items():
-            if field_type == "password":
-                password_field = name
-                break
-        username_field = None
-        priorities = ("account", "member", "userid", "username", "login", "email", "id")
+        password_field = next(
+            (name for name, field_type in form.field_types.items() if field_type == "password"),
+            None,
+        )
+        fallback = None
         for name, field_type in form.field_types.items():
-            if name == password_field:
+            if field_type not in _USERNAME_FIELD_TYPES:
                 continue
-            if field_type in {"text", "email", "tel"}:
-                lowered = name.lower()
-                for keyword in priorities:
-                    if keyword in lowered:
-                        username_field = name
-                        break
-                if username_field:
-                    break
-                if username_field is None:
-                    username_field = name
-        return username_field, password_field
+            if _LOGIN_KEYWORD_RE.search(name):
+                return name, password_field
+            if fallback is None:
+                fallback = name
+        return fallback, password_field
+
+    @classmethod
+    def _page_indicates_failure(cls, page: Page) -> bool:
+        if page.is_utf8:
+            return cls._detect_login_failure_bytes(page.raw)
+        return cls._detect_login_failure(page.body)
 
     @staticmethod
     def _detect_login_failure(body: str) -> bool:
-        failure_signatures: Iterable[str] = (
-            "登入失敗",
-            "login failed",
-            "密碼錯誤",
-            "驗證碼",
-        )
-        lowered = body.lower()
-        return any(signature in lowered for signature in failure_signatures)
+        if any(signature in body for signature in _FAILURE_SIGNATURES):
+            return True
+        return _ASCII_FAILURE_SIGNATURE in body.lower()
+
+    @staticmethod
+    def _detect_login_failure_bytes(raw: bytes) -> bool:
+        if any(raw.find(signature) >= 0 for signature in _FAILURE_BYTES):
+            return True
+        # bytes.lower() folds ASCII only, which leaves UTF-8 sequences intact.
+        return _ASCII_FAILURE_BYTES in raw.lower()
 
     def poll_until(
         self,
@@ -158,10 +262,20 @@ class KhamTicketClient:
         interval: float = 0.5,
         max_attempts: int = 30,
     ) -> Optional[Page]:
+        delay = interval
         for attempt in range(max_attempts):
-            page = self.fetch(url)
+            # The first request is always unconditional: validators left by an
+            # earlier fetch would otherwise yield 304s for a page that already
+            # satisfies the predicate. Later attempts reuse the validators that
+            # this poll's own responses recorded.
+            page = self._request("GET", url, conditional=attempt > 0)
+            if page.status == 304:
+                # Unchanged since the last poll: back off instead of re-checking.
+                time.sleep(delay)
+                delay = min(delay * 2, interval * _MAX_BACKOFF_FACTOR)
+                continue
+            delay = interval
             if predicate(page):
                 return page
             time.sleep(interval)
         return None
-
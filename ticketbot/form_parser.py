@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from html.parser import HTMLParser
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin
 
+try:  # pragma: no cover - optional accelerated parser
+    import lxml.etree
+except ImportError:  # pragma: no cover - fall back to the pure-Python parser
+    lxml = None  # type: ignore[assignment]
 
-@dataclass
+_FORM_TAGS = frozenset({"form", "input", "textarea", "select", "option"})
+# Comments and script/style blocks are matched (and skipped) alongside the form
+# tags, so form markup quoted inside them neither opens nor closes a form.
+_FORM_TOKEN_RE = re.compile(
+    r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>|(?P<open><form\b[^>]*>)|(?P<close></form\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+@dataclass(slots=True)
 class FormDetails:
     """Representation of a HTML form that can be submitted via HTTP."""
 
@@ -18,17 +32,29 @@ class FormDetails:
     field_types: Dict[str, str]
 
     def merged_with(self, overrides: Optional[Dict[str, str]] = None) -> Tuple[str, str, Dict[str, str]]:
-        data = dict(self.fields)
-        if overrides:
-            data.update({k: v for k, v in overrides.items() if k})
+        if not overrides:
+            return self.action, self.method.upper(), dict(self.fields)
+        data = {**self.fields, **overrides}
+        data.pop("", None)  # drop unnamed overrides; parsed fields always have names
         return self.action, self.method.upper(), data
 
 
-class _FormHTMLParser(HTMLParser):
-    def __init__(self, base_url: str) -> None:
-        super().__init__()
+class StopParsing(Exception):
+    """Raised by :class:`_FormTarget` to abort parsing once a form matched."""
+
+
+class _FormTarget:
+    """Parser target collecting forms from start/end/data events.
+
+    The same state machine backs both the lxml target parser and the
+    html.parser fallback, so the two produce identical :class:`FormDetails`.
+    """
+
+    def __init__(self, base_url: str, predicate: Optional[Callable[[FormDetails], bool]] = None) -> None:
         self.base_url = base_url
+        self.predicate = predicate
         self.forms: List[FormDetails] = []
+        self.match: Optional[FormDetails] = None
         self._current_action: Optional[str] = None
         self._current_method: str = "GET"
         self._current_fields: Dict[str, str] = {}
@@ -37,21 +63,20 @@ class _FormHTMLParser(HTMLParser):
         self._current_select_value: Optional[str] = None
         self._current_textarea: Optional[str] = None
 
-    def handle_starttag(self, tag: str, attrs_list):
-        attrs = dict(attrs_list)
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
         if tag == "form":
-            self._current_action = urljoin(self.base_url, attrs.get("action", ""))
-            self._current_method = attrs.get("method", "GET").upper()
+            self._current_action = urljoin(self.base_url, attrs.get("action") or "")
+            self._current_method = (attrs.get("method") or "GET").upper()
             self._current_fields = {}
             self._current_types = {}
         elif tag == "input" and self._current_action is not None:
             name = attrs.get("name")
             if not name:
                 return
-            input_type = attrs.get("type", "text").lower()
+            input_type = (attrs.get("type") or "text").lower()
             if input_type in {"submit", "button", "image"}:
                 return
-            self._current_fields[name] = attrs.get("value", "")
+            self._current_fields[name] = attrs.get("value") or ""
             self._current_types[name] = input_type
         elif tag == "textarea" and self._current_action is not None:
             name = attrs.get("name")
@@ -68,26 +93,28 @@ class _FormHTMLParser(HTMLParser):
             self._current_select_value = None
             self._current_types[name] = "select"
         elif tag == "option" and self._current_select:
-            value = attrs.get("value", "")
+            value = attrs.get("value") or ""
             if self._current_select_value is None or ("selected" in attrs):
                 self._current_select_value = value
 
-    def handle_endtag(self, tag: str):
+    def end(self, tag: str) -> None:
         if tag == "form" and self._current_action is not None:
-            self.forms.append(
-                FormDetails(
-                    action=self._current_action,
-                    method=self._current_method,
-                    fields=dict(self._current_fields),
-                    field_types=dict(self._current_types),
-                )
+            form = FormDetails(
+                action=self._current_action,
+                method=self._current_method,
+                fields=dict(self._current_fields),
+                field_types=dict(self._current_types),
             )
+            self.forms.append(form)
             self._current_action = None
             self._current_fields = {}
             self._current_types = {}
             self._current_select = None
             self._current_select_value = None
             self._current_textarea = None
+            if self.predicate is not None and self.predicate(form):
+                self.match = form
+                raise StopParsing()
         elif tag == "select" and self._current_select:
             self._current_fields[self._current_select] = self._current_select_value or ""
             self._current_select = None
@@ -95,7 +122,7 @@ class _FormHTMLParser(HTMLParser):
         elif tag == "textarea":
             self._current_textarea = None
 
-    def handle_data(self, data: str):
+    def data(self, data: str) -> None:
         if self._current_select and self._current_select_value is None:
             stripped = data.strip()
             if stripped:
@@ -104,6 +131,30 @@ class _FormHTMLParser(HTMLParser):
             existing = self._current_fields.get(self._current_textarea, "")
             self._current_fields[self._current_textarea] = existing + data
 
+    def close(self) -> List[FormDetails]:
+        return self.forms
+
+
+class _FormHTMLParser(HTMLParser):
+    """Pure-Python fallback driving :class:`_FormTarget` when lxml is missing."""
+
+    def __init__(self, target: _FormTarget) -> None:
+        super().__init__()
+        self.target = target
+
+    def handle_starttag(self, tag: str, attrs_list):
+        if tag not in _FORM_TAGS:
+            return
+        self.target.start(tag, dict(attrs_list))
+
+    def handle_endtag(self, tag: str):
+        if tag not in _FORM_TAGS:
+            return
+        self.target.end(tag)
+
+    def handle_data(self, data: str):
+        self.target.data(data)
+
 
 class FormParser:
     """Parse forms from raw HTML."""
@@ -112,16 +163,60 @@ class FormParser:
         self.base_url = base_url
 
     def parse(self, html: str) -> Iterable[FormDetails]:
-        parser = _FormHTMLParser(self.base_url)
-        parser.feed(html)
-        return list(parser.forms)
+        target = _FormTarget(self.base_url)
+        self._run(html, target)
+        return target.forms
+
+    def parse_first(self, html: str, predicate: Callable[[FormDetails], bool]) -> Optional[FormDetails]:
+        """Return the first form satisfying ``predicate``.
+
+        Parsing stops as soon as a matching ``</form>`` is seen, so the rest
+        of the document is never processed.
+        """
+
+        target = _FormTarget(self.base_url, predicate)
+        self._run(html, target)
+        return target.match
 
     def find_first(self, html: str, *, include_password: bool = False) -> Optional[FormDetails]:
-        for form in self.parse(html):
-            if include_password and not self._has_password_field(form):
-                continue
-            return form
-        return None
+        if include_password:
+            return self.parse_first(html, self._has_password_field)
+        return self.parse_first(html, lambda form: True)
+
+    @staticmethod
+    def _form_markup(html: str) -> str:
+        """Return only the ``<form>...</form>`` ranges of ``html``.
+
+        Ticketing pages are mostly scripts and layout, so handing the parser
+        just the form markup skips most of the document. The full page is
+        returned when no complete form is found outside comments and
+        script/style blocks.
+        """
+
+        ranges: List[str] = []
+        start: Optional[int] = None
+        for match in _FORM_TOKEN_RE.finditer(html):
+            if match.group("open"):
+                if start is None:
+                    start = match.start()
+            elif match.group("close") and start is not None:
+                ranges.append(html[start : match.end()])
+                start = None
+        return "".join(ranges) if ranges else html
+
+    @classmethod
+    def _run(cls, html: str, target: _FormTarget) -> None:
+        html = cls._form_markup(html)
+        try:
+            if lxml is None:
+                parser = _FormHTMLParser(target)
+                parser.feed(html)
+                parser.close()
+            elif html.strip():
+                lxml_parser = lxml.etree.HTMLParser(target=target, encoding="utf-8")
+                lxml.etree.fromstring(html.encode("utf-8"), lxml_parser)
+        except StopParsing:
+            pass
 
     @staticmethod
     def _has_password_field(form: FormDetails) -> bool:
@@ -129,4 +224,3 @@ class FormParser:
             if field_type == "password" or "pass" in name.lower():
                 return True
         return False
-
@@ -3,35 +3,159 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import concurrent.futures
 import contextlib
-import io
+import queue
+import re
 import threading
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
 try:  # pragma: no cover - runtime availability check
     import tkinter as tk
-    from tkinter import filedialog, messagebox, ttk
+    from tkinter import filedialog, ttk
 except ImportError as exc:  # pragma: no cover - guard for environments without Tk
     tk = None  # type: ignore[assignment]
     ttk = None  # type: ignore[assignment]
     filedialog = None  # type: ignore[assignment]
-    messagebox = None  # type: ignore[assignment]
     _TK_IMPORT_ERROR = exc
 else:
     _TK_IMPORT_ERROR = None
 
 from . import cli
 
+_root_cache: "Optional[tk.Tk]" = None
+
+# Control, or Command (Mod1) on macOS, for the copy and select-all chords.
+_COPY_MODIFIER_MASK = 0x4 | 0x8
+_COPY_CHORD_KEYS = frozenset({"a", "c", "insert"})
+_EXTRA_RE = re.compile(r"\S+=\S*")
+_OUTPUT_NAVIGATION_KEYS = frozenset(
+    {"Up", "Down", "Left", "Right", "Prior", "Next", "Home", "End", "Tab", "ISO_Left_Tab"}
+)
+
+
+def _get_or_create_root() -> "tk.Tk":
+    """Return the process-wide Tk root, creating the Tcl interpreter only once.
+
+    A cached root is cleared of the previous session's widgets and shown
+    again, so repeated :func:`run_gui` calls skip interpreter start-up.
+    """
+
+    global _root_cache
+    if _root_cache is not None:
+        try:
+            _root_cache.winfo_exists()
+        except tk.TclError:
+            _root_cache = None
+    if _root_cache is None:
+        _root_cache = tk.Tk()
+    else:
+        for child in _root_cache.winfo_children():
+            child.destroy()
+        _root_cache.deiconify()
+    return _root_cache
+
+
+class _QueueWriter:
+    """Write sink that hands complete lines to a queue drained by the GUI thread.
+
+    Partial writes collect in a list and are joined once per line, so a
+    ``print`` call costs one queue put rather than one per ``write``.
+    """
+
+    __slots__ = ("_queue", "_parts")
+
+    def __init__(self, output_queue: "queue.Queue[Optional[str]]") -> None:
+        self._queue = output_queue
+        self._parts: List[str] = []
+
+    def write(self, text: str) -> int:
+        if text:
+            self._parts.append(text)
+            if text.endswith("\n"):
+                self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._parts:
+            self._queue.put("".join(self._parts))
+            self._parts.clear()
+
+
+class _SerialExecutor(concurrent.futures.Executor):
+    """Executor running submitted calls one at a time on a daemon thread.
+
+    Commands share one :class:`~ticketbot.client.KhamTicketClient`, which is
+    not thread-safe, so they must not overlap. ThreadPoolExecutor workers are
+    also joined at interpreter exit, which would keep the process alive until
+    a running poll finished after the window closed.
+    """
+
+    def __init__(self) -> None:
+        self._work: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._worker, name="ticketbot-gui-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> "concurrent.futures.Future":
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: "concurrent.futures.Future" = concurrent.futures.Future()
+            self._work.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            self._work.put(None)
+        if wait:
+            self._thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:  # pragma: no cover - propagated through the future
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
 
 class TicketBotGUI:
     """Tkinter based desktop interface for triggering ticket bot commands."""
 
+    FLUSH_INTERVAL_MS = 50
+    DRAIN_BATCH_SIZE = 512
+    MAX_OUTPUT_LINES = 5000
+    STATUS_CLEAR_MS = 5000
+
     def __init__(self, master: "Optional[tk.Misc]" = None) -> None:
         if tk is None:  # pragma: no cover - exercised only when Tk is missing
             raise RuntimeError("Tkinter is required to run the GUI") from _TK_IMPORT_ERROR
 
-        self._root = master or tk.Tk()
+        self._root = master or _get_or_create_root()
         self._owns_root = master is None
+        if self._owns_root:
+            self._root.protocol("WM_DELETE_WINDOW", self._close)
         self._root.title("KHAM Ticket Bot")
         self._root.geometry("800x620")
 
@@ -49,6 +173,40 @@ class TicketBotGUI:
         self._run_config_path = tk.StringVar()
         self._run_verbose = tk.BooleanVar(value=False)
 
+        self._base_url_value = cli.DEFAULT_BASE_URL
+        self._timeout_value = cli.DEFAULT_TIMEOUT
+        # Traces are removed on shutdown; on a reused root they would otherwise
+        # keep this instance alive through Tcl's references to the callbacks.
+        self._traces = [
+            (self._base_url, self._base_url.trace_add("write", self._on_base_url_changed)),
+            (self._timeout, self._timeout.trace_add("write", self._on_timeout_changed)),
+        ]
+
+        # One Namespace per action, refilled on each click. The action's button
+        # stays disabled while its command runs, so a Namespace is never
+        # mutated while a worker is still reading it.
+        self._login_args = argparse.Namespace(
+            base_url="", timeout=0.0, account="", password="", login_page=None, extra=[], dump_html=False
+        )
+        self._forms_args = argparse.Namespace(base_url="", timeout=0.0, url=None, include_password=False)
+        self._run_args = argparse.Namespace(base_url="", timeout=0.0, config="", verbose=False)
+
+        self._pending: List[str] = []
+        self._flush_scheduled = False
+        self._after_ids: Set[str] = set()
+        self._action_buttons: Dict[str, "ttk.Button"] = {}
+        self._status = tk.StringVar()
+        self._status_clear_id: Optional[str] = None
+        # Dialog availability is fixed at import time; resolve it once.
+        self._ask_open_filename: Optional[Callable[..., str]] = (
+            filedialog.askopenfilename if filedialog is not None else None
+        )
+
+        self._executor = _SerialExecutor()
+        self._loop = asyncio.new_event_loop()
+        self._closed = False
+        threading.Thread(target=self._run_loop, daemon=True).start()
+
         self._build_layout()
 
     # ------------------------------------------------------------------
@@ -59,18 +217,39 @@ class TicketBotGUI:
 
         container = ttk.Frame(self._root, padding=12)
         container.pack(fill=tk.BOTH, expand=True)
+        # Covers embedded use, where the caller destroys the master window.
+        container.bind("<Destroy>", lambda event: self._shutdown())
+
+        self._build_connection_frame(container)
 
         notebook = ttk.Notebook(container)
         notebook.pack(fill=tk.BOTH, expand=True)
 
-        notebook.add(self._build_login_tab(notebook), text="登入")
-        notebook.add(self._build_forms_tab(notebook), text="表單")
-        notebook.add(self._build_run_tab(notebook), text="自動流程")
+        # Tabs start as empty placeholders and are filled in on first selection.
+        self._notebook = notebook
+        self._tab_builders = {0: self._build_login_tab, 1: self._build_forms_tab, 2: self._build_run_tab}
+        self._tab_frames: List["ttk.Frame"] = []
+        self._tab_built = [False] * len(self._tab_builders)
+        for text in ("登入", "表單", "自動流程"):
+            frame = self._new_tab_frame(notebook)
+            notebook.add(frame, text=text)
+            self._tab_frames.append(frame)
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._on_tab_changed()
 
         output_frame = ttk.LabelFrame(container, text="輸出", padding=(10, 6))
         output_frame.pack(fill=tk.BOTH, expand=True, pady=(12, 0))
 
-        self._output = tk.Text(output_frame, height=12, wrap="word", state=tk.DISABLED)
+        # The widget stays NORMAL and is made read-only by swallowing edits, so
+        # appends need no state toggles.
+        self._output = tk.Text(output_frame, height=12, wrap="word")
+        self._output.bind("<Key>", self._on_output_key)
+        for sequence in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+            self._output.bind(sequence, lambda event: "break")
+        # Right gravity keeps the mark after each insert, so scrolling follows
+        # a mark instead of re-resolving the "end" index on every flush.
+        self._output.mark_set("tail", tk.END)
+        self._output.mark_gravity("tail", tk.RIGHT)
         self._output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         scrollbar = ttk.Scrollbar(output_frame, orient="vertical", command=self._output.yview)
@@ -80,68 +259,67 @@ class TicketBotGUI:
         controls = ttk.Frame(container)
         controls.pack(fill=tk.X, pady=(8, 0))
         ttk.Button(controls, text="清除輸出", command=self._clear_output).pack(side=tk.RIGHT)
+        ttk.Label(controls, textvariable=self._status, foreground="red").pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-    def _build_login_tab(self, parent: "tk.Misc"):
-        frame = ttk.Frame(parent, padding=12)
+    @staticmethod
+    def _new_tab_frame(notebook: "ttk.Notebook") -> "ttk.Frame":
+        frame = ttk.Frame(notebook, padding=12)
         frame.columnconfigure(1, weight=1)
+        return frame
+
+    def _on_tab_changed(self, event: "Optional[tk.Event]" = None) -> None:
+        index = self._notebook.index(self._notebook.select())
+        if not self._tab_built[index]:
+            self._tab_builders[index](self._tab_frames[index])
+            self._tab_built[index] = True
+
+    def _build_connection_frame(self, parent: "tk.Misc") -> None:
+        frame = ttk.Frame(parent)
+        frame.columnconfigure(1, weight=1)
+        frame.pack(fill=tk.X, pady=(0, 8))
 
         self._add_labeled_entry(frame, "基礎網址", self._base_url, row=0)
         self._add_labeled_entry(frame, "逾時秒數", self._timeout, row=1)
-        self._add_labeled_entry(frame, "帳號", self._login_account, row=2)
-        self._add_labeled_entry(frame, "密碼", self._login_password, row=3, show="*")
-        self._add_labeled_entry(frame, "登入頁面", self._login_page, row=4)
-        self._add_labeled_entry(frame, "額外欄位 (key=value)", self._login_extra, row=5)
-
-        dump_checkbox = ttk.Checkbutton(frame, text="顯示回應 HTML", variable=self._login_dump_html)
-        dump_checkbox.grid(row=6, column=1, sticky="w", pady=(4, 8))
 
-        ttk.Button(frame, text="執行登入", command=self._on_login).grid(
-            row=7, column=1, sticky="e", pady=(8, 0)
-        )
+    def _build_login_tab(self, frame: "ttk.Frame") -> None:
+        self._add_labeled_entry(frame, "帳號", self._login_account, row=0)
+        self._add_labeled_entry(frame, "密碼", self._login_password, row=1, show="*")
+        self._add_labeled_entry(frame, "登入頁面", self._login_page, row=2)
+        self._add_labeled_entry(frame, "額外欄位 (key=value)", self._login_extra, row=3)
 
-        return frame
+        dump_checkbox = ttk.Checkbutton(frame, text="顯示回應 HTML", variable=self._login_dump_html)
+        dump_checkbox.grid(row=4, column=1, sticky="w", pady=(4, 8))
 
-    def _build_forms_tab(self, parent: "tk.Misc"):
-        frame = ttk.Frame(parent, padding=12)
-        frame.columnconfigure(1, weight=1)
+        self._login_btn = ttk.Button(frame, text="執行登入", command=self._on_login)
+        self._login_btn.grid(row=5, column=1, sticky="e", pady=(8, 0))
+        self._action_buttons["登入"] = self._login_btn
 
-        self._add_labeled_entry(frame, "基礎網址", self._base_url, row=0)
-        self._add_labeled_entry(frame, "逾時秒數", self._timeout, row=1)
-        self._add_labeled_entry(frame, "檢視網址", self._forms_url, row=2)
+    def _build_forms_tab(self, frame: "ttk.Frame") -> None:
+        self._add_labeled_entry(frame, "檢視網址", self._forms_url, row=0)
 
         include_checkbox = ttk.Checkbutton(
             frame,
             text="僅顯示包含密碼欄位的表單",
             variable=self._forms_include_password,
         )
-        include_checkbox.grid(row=3, column=1, sticky="w", pady=(4, 8))
-
-        ttk.Button(frame, text="擷取表單", command=self._on_dump_forms).grid(
-            row=4, column=1, sticky="e", pady=(8, 0)
-        )
+        include_checkbox.grid(row=1, column=1, sticky="w", pady=(4, 8))
 
-        return frame
-
-    def _build_run_tab(self, parent: "tk.Misc"):
-        frame = ttk.Frame(parent, padding=12)
-        frame.columnconfigure(1, weight=1)
+        self._forms_btn = ttk.Button(frame, text="擷取表單", command=self._on_dump_forms)
+        self._forms_btn.grid(row=2, column=1, sticky="e", pady=(8, 0))
+        self._action_buttons["擷取表單"] = self._forms_btn
 
-        self._add_labeled_entry(frame, "基礎網址", self._base_url, row=0)
-        self._add_labeled_entry(frame, "逾時秒數", self._timeout, row=1)
-
-        ttk.Label(frame, text="設定檔").grid(row=2, column=0, sticky="w", pady=(6, 0))
+    def _build_run_tab(self, frame: "ttk.Frame") -> None:
+        ttk.Label(frame, text="設定檔").grid(row=0, column=0, sticky="w", pady=(6, 0))
         entry = ttk.Entry(frame, textvariable=self._run_config_path)
-        entry.grid(row=2, column=1, sticky="ew", pady=(6, 0))
-        ttk.Button(frame, text="瀏覽...", command=self._browse_config).grid(row=2, column=2, padx=(6, 0))
+        entry.grid(row=0, column=1, sticky="ew", pady=(6, 0))
+        ttk.Button(frame, text="瀏覽...", command=self._browse_config).grid(row=0, column=2, padx=(6, 0))
 
         verbose_checkbox = ttk.Checkbutton(frame, text="輸出完整 HTML", variable=self._run_verbose)
-        verbose_checkbox.grid(row=3, column=1, sticky="w", pady=(4, 8))
-
-        ttk.Button(frame, text="執行流程", command=self._on_run_config).grid(
-            row=4, column=1, sticky="e", pady=(8, 0)
-        )
+        verbose_checkbox.grid(row=1, column=1, sticky="w", pady=(4, 8))
 
-        return frame
+        self._run_btn = ttk.Button(frame, text="執行流程", command=self._on_run_config)
+        self._run_btn.grid(row=2, column=1, sticky="e", pady=(8, 0))
+        self._action_buttons["執行流程"] = self._run_btn
 
     def _add_labeled_entry(
         self,
@@ -166,24 +344,31 @@ class TicketBotGUI:
             self._notify_error("請輸入帳號與密碼後再嘗試登入。")
             return
 
-        args = argparse.Namespace(
-            base_url=self._normalize_text(self._base_url.get(), cli.DEFAULT_BASE_URL),
-            timeout=self._parse_timeout(self._timeout.get()),
-            account=account,
-            password=password,
-            login_page=self._normalize_optional(self._login_page.get()),
-            extra=self._split_extra(self._login_extra.get()),
-            dump_html=bool(self._login_dump_html.get()),
-        )
+        extra_text = self._login_extra.get()
+        extra = self._split_extra(extra_text)
+        if extra_text and len(extra) != len(extra_text.split()):
+            # _split_extra drops tokens without "="; report them rather than
+            # sending the login without those fields.
+            rejected = [token for token in extra_text.split() if not _EXTRA_RE.fullmatch(token)]
+            self._notify_error(f"額外欄位格式錯誤 (需為 key=value)：{' '.join(rejected)}")
+            return
+
+        args = self._login_args
+        args.base_url = self._base_url_value
+        args.timeout = self._timeout_value
+        args.account = account
+        args.password = password
+        args.login_page = self._normalize_optional(self._login_page.get())
+        args.extra = extra
+        args.dump_html = bool(self._login_dump_html.get())
         self._run_command("登入", cli.command_login, args)
 
     def _on_dump_forms(self) -> None:
-        args = argparse.Namespace(
-            base_url=self._normalize_text(self._base_url.get(), cli.DEFAULT_BASE_URL),
-            timeout=self._parse_timeout(self._timeout.get()),
-            url=self._normalize_optional(self._forms_url.get()),
-            include_password=bool(self._forms_include_password.get()),
-        )
+        args = self._forms_args
+        args.base_url = self._base_url_value
+        args.timeout = self._timeout_value
+        args.url = self._normalize_optional(self._forms_url.get())
+        args.include_password = bool(self._forms_include_password.get())
         self._run_command("擷取表單", cli.command_dump_forms, args)
 
     def _on_run_config(self) -> None:
@@ -192,20 +377,25 @@ class TicketBotGUI:
             self._notify_error("請先選擇設定檔再執行流程。")
             return
 
-        args = argparse.Namespace(
-            base_url=self._normalize_text(self._base_url.get(), cli.DEFAULT_BASE_URL),
-            timeout=self._parse_timeout(self._timeout.get()),
-            config=config_path,
-            verbose=bool(self._run_verbose.get()),
-        )
+        args = self._run_args
+        args.base_url = self._base_url_value
+        args.timeout = self._timeout_value
+        args.config = config_path
+        args.verbose = bool(self._run_verbose.get())
         self._run_command("執行流程", cli.command_run_config, args)
 
+    def _on_base_url_changed(self, *_: object) -> None:
+        self._base_url_value = self._normalize_text(self._base_url.get(), cli.DEFAULT_BASE_URL)
+
+    def _on_timeout_changed(self, *_: object) -> None:
+        self._timeout_value = self._parse_timeout(self._timeout.get())
+
     def _browse_config(self) -> None:
-        if filedialog is None:  # pragma: no cover - depends on Tk availability
+        if self._ask_open_filename is None:  # pragma: no cover - depends on Tk availability
             self._notify_error("目前環境不支援檔案對話框。")
             return
 
-        path = filedialog.askopenfilename(
+        path = self._ask_open_filename(
             title="選擇設定檔",
             filetypes=(("JSON", "*.json"), ("所有檔案", "*.*")),
         )
@@ -221,58 +411,142 @@ class TicketBotGUI:
         func: Callable[[argparse.Namespace], int],
         args: argparse.Namespace,
     ) -> None:
+        button = self._action_buttons.get(label)
+        if button is not None:
+            button.state(["disabled"])
         self._append_output(f"[{label}] 開始執行...\n")
+        output_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        exit_codes: List[int] = []
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_async(func, args, _QueueWriter(output_queue)),
+            self._loop,
+        )
+
+        def on_done(done: "concurrent.futures.Future[int]") -> None:
+            failed = done.cancelled() or done.exception() is not None
+            exit_codes.append(1 if failed else done.result())
+            output_queue.put(None)
+
+        future.add_done_callback(on_done)
+        self._after(self.FLUSH_INTERVAL_MS, self._drain_queue, label, output_queue, exit_codes)
+
+    async def _run_async(
+        self,
+        func: Callable[[argparse.Namespace], int],
+        args: argparse.Namespace,
+        writer: _QueueWriter,
+    ) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._invoke, func, args, writer)
 
-        def worker() -> None:
-            buffer = io.StringIO()
-            with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
-                try:
-                    exit_code = func(args)
-                except Exception as exc:  # pragma: no cover - surfaced via UI
-                    exit_code = 1
-                    buffer.write(f"Error: {exc}\n")
-            output = buffer.getvalue().strip()
-            self._root.after(0, lambda: self._finalize_command(label, exit_code, output))
-
-        threading.Thread(target=worker, daemon=True).start()
-
-    def _finalize_command(self, label: str, exit_code: int, output: str) -> None:
-        if output:
-            self._append_output(f"{output}\n")
+    @staticmethod
+    def _invoke(func: Callable[[argparse.Namespace], int], args: argparse.Namespace, writer: _QueueWriter) -> int:
+        with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+            try:
+                return func(args)
+            except Exception as exc:  # pragma: no cover - surfaced via UI
+                writer.write(f"Error: {exc}\n")
+                return 1
+            finally:
+                writer.flush()
+
+    def _drain_queue(self, label: str, output_queue: "queue.Queue[Optional[str]]", exit_codes: List[int]) -> None:
+        chunks: List[str] = []
+        finished = False
+        for _ in range(self.DRAIN_BATCH_SIZE):
+            try:
+                item = output_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                break
+            chunks.append(item)
+        if chunks:
+            self._append_output("".join(chunks))
+        if finished:
+            self._finalize_command(label, exit_codes[0])
+        else:
+            self._after(self.FLUSH_INTERVAL_MS, self._drain_queue, label, output_queue, exit_codes)
+
+    def _finalize_command(self, label: str, exit_code: int) -> None:
+        button = self._action_buttons.get(label)
+        if button is not None:
+            button.state(["!disabled"])
         status = "成功" if exit_code == 0 else f"失敗 (代碼 {exit_code})"
         self._append_output(f"[{label}] {status}\n")
         if exit_code != 0:
             self._notify_error(f"{label} 執行失敗，詳情請見輸出區。")
 
+    def _after(self, delay_ms: int, callback: Callable[..., None], *args: object) -> str:
+        """Schedule ``callback`` on the Tk loop, tracking the id until it runs.
+
+        Tracked callbacks are cancelled on close, so a reused root never runs
+        them against the previous session's destroyed widgets.
+        """
+
+        def run() -> None:
+            self._after_ids.discard(after_id)
+            callback(*args)
+
+        after_id = self._root.after(delay_ms, run)
+        self._after_ids.add(after_id)
+        return after_id
+
+    def _cancel_after(self, after_id: str) -> None:
+        self._after_ids.discard(after_id)
+        self._root.after_cancel(after_id)
+
     def _append_output(self, text: str) -> None:
-        self._output.configure(state=tk.NORMAL)
+        self._pending.append(text)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._after(self.FLUSH_INTERVAL_MS, self._flush_output)
+
+    def _flush_output(self) -> None:
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
         self._output.insert(tk.END, text)
-        self._output.see(tk.END)
-        self._output.configure(state=tk.DISABLED)
+        # A trailing newline leaves an empty last line that holds no output.
+        line, column = self._output.index("end-1c").split(".")
+        line_count = int(line) - (column == "0")
+        excess = line_count - self.MAX_OUTPUT_LINES
+        if excess > 0:
+            self._output.delete("1.0", f"{excess + 1}.0")
+        self._output.see("tail")
+
+    @staticmethod
+    def _on_output_key(event: "tk.Event") -> Optional[str]:
+        if event.keysym in _OUTPUT_NAVIGATION_KEYS:
+            return None
+        if event.state & _COPY_MODIFIER_MASK and event.keysym.lower() in _COPY_CHORD_KEYS:
+            return None
+        return "break"
 
     def _clear_output(self) -> None:
-        self._output.configure(state=tk.NORMAL)
+        self._pending.clear()
         self._output.delete("1.0", tk.END)
-        self._output.configure(state=tk.DISABLED)
 
     def _notify_error(self, message: str) -> None:
         self._append_output(f"[錯誤] {message}\n")
-        if messagebox is not None:
-            messagebox.showerror("Ticket Bot", message, parent=self._root)
+        self._status.set(message)
+        if self._status_clear_id is not None:
+            self._cancel_after(self._status_clear_id)
+        self._status_clear_id = self._after(self.STATUS_CLEAR_MS, self._clear_status)
+
+    def _clear_status(self) -> None:
+        self._status_clear_id = None
+        self._status.set("")
 
     # ------------------------------------------------------------------
     # Utility helpers
     # ------------------------------------------------------------------
     @staticmethod
     def _split_extra(value: str | None) -> List[str]:
-        if not value:
-            return []
-        tokens: List[str] = []
-        for part in value.replace("\n", " ").split(" "):
-            part = part.strip()
-            if part:
-                tokens.append(part)
-        return tokens
+        return _EXTRA_RE.findall(value) if value else []
 
     @staticmethod
     def _normalize_text(value: str | None, default: str) -> str:
@@ -300,6 +574,39 @@ class TicketBotGUI:
     def run(self) -> None:
         if self._owns_root:
             self._root.mainloop()
+            self._shutdown()
+
+    def _run_loop(self) -> None:
+        loop = self._loop
+        try:
+            loop.run_forever()
+            # Commands still waiting on the executor are cancelled with it.
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            loop.close()
+
+    def _shutdown(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for after_id in list(self._after_ids):
+            with contextlib.suppress(tk.TclError):
+                self._cancel_after(after_id)
+        for variable, trace_id in self._traces:
+            with contextlib.suppress(tk.TclError):
+                variable.trace_remove("write", trace_id)
+        self._traces = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _close(self) -> None:
+        self._shutdown()
+        # Hide rather than destroy so the cached root can host the next session.
+        self._root.withdraw()
+        self._root.quit()
 
 
 def run_gui() -> None: